@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-import re
-import tomllib
+import os
+import sys
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
 from types import MappingProxyType
-from typing import Any, Mapping
+from typing import Any, Callable, Mapping, TypeAlias
 
-from .context import Context
+from .context import Context, resolve_env_and_home
 from .keys import DirKey, KeyLike, normalize_key
 
 
@@ -15,9 +16,6 @@ class VFXDirsConfigError(ValueError):
     """Raised when config TOML cannot be parsed/validated."""
 
 
-_ENV_VAR_PATTERN = re.compile(r"\$(\w+)|\$\{([^}]+)\}")
-
-
 def default_config_path(ctx: Context) -> Path:
     """Return the OS-appropriate default config file path."""
 
@@ -25,46 +23,88 @@ def default_config_path(ctx: Context) -> Path:
 
 
 def _expand_env_vars(value: str, env: Mapping[str, str]) -> str:
-    def repl(match: re.Match[str]) -> str:
-        var = match.group(1) or match.group(2)
-        if not var:
-            return match.group(0)
-        return env.get(var, match.group(0))
+    # expands `$VAR` and `${VAR}`, unknown vars are left untouched
+    i = value.find("$")
+    if i < 0:
+        return value
+
+    out: list[str] = []
+    start = 0
+    n = len(value)
+    while i >= 0:
+        j = i + 1
+        if j < n and value[j] == "{":
+            close = value.find("}", j + 1)
+            if close > j + 1:
+                var = value[j + 1:close]
+                end = close + 1
+            else:
+                var, end = "", j
+        else:
+            end = j
+            while end < n and (value[end].isalnum() or value[end] == "_"):
+                end += 1
+            var = value[j:end]
+
+        if var and var in env:
+            out.append(value[start:i])
+            out.append(env[var])
+            start = end
+        i = value.find("$", max(end, j))
+
+    out.append(value[start:])
+    return "".join(out)
+
+
+def _expand_user(value: str, home: str) -> str:
+    # pass home to make tests easier
+    if value[:1] != "~":
+        return value
+    if len(value) == 1:
+        return home
+    if value[1] == "/" or value[1] == "\\":
+        return home + value[1:]
+    return value
 
-    return _ENV_VAR_PATTERN.sub(repl, value)
 
+def _is_absolute(path: str) -> bool:
+    # match `Path.is_absolute`: before 3.13, ntpath.isabs accepts rooted
+    # paths without a drive ("\\foo"), which pathlib treats as relative
+    if not os.path.isabs(path):
+        return False
+    return os.name != "nt" or bool(os.path.splitdrive(path)[0])
 
-def _expand_user(value: str, home: Path) -> str:
-    # pass home to make tests easier
-    if value == "~":
-        return str(home)
-    if value.startswith("~/") or value.startswith("~\\"):
-        return str(home) + value[1:]
-    return value
 
+_PathParser: TypeAlias = Callable[[Any, str], Path]
 
-def _parse_path(
-    raw: Any,
-    *,
+
+def _make_path_parser(
     env: Mapping[str, str],
     home: Path,
     base_dir: Path,
-    where: str,
-) -> Path:
-    if not isinstance(raw, str):
-        raise VFXDirsConfigError(
-            f"{where} must be a string path but got {type(raw).__name__}")
+) -> _PathParser:
+    """Return a `parse(raw, where)` callable bound to one config's inputs."""
+
+    home_str = str(home)
+    base_dir_str = os.fspath(base_dir)
+
+    def parse(raw: Any, where: str) -> Path:
+        if not isinstance(raw, str):
+            raise VFXDirsConfigError(
+                f"{where} must be a string path but got {type(raw).__name__}")
+
+        raw_str = raw.strip()
+        if not raw_str:
+            raise VFXDirsConfigError(f"{where} cannot be an empty path")
 
-    raw_str = raw.strip()
-    if not raw_str:
-        raise VFXDirsConfigError(f"{where} cannot be an empty path")
+        expanded = _expand_user(raw_str, home_str)
+        expanded = _expand_env_vars(expanded, env)
+        # string checks avoid allocating an intermediate Path per entry
+        if not _is_absolute(expanded):
+            expanded = os.path.join(base_dir_str, expanded)
+        return Path(expanded)
 
-    expanded = _expand_user(raw_str, home)
-    expanded = _expand_env_vars(expanded, env)
-    p = Path(expanded)
-    if not p.is_absolute():
-        p = base_dir / p
-    return p
+    return parse
 
 
 @dataclass(frozen=True, slots=True)
@@ -81,6 +121,10 @@ class InstallOverride:
         )
 
 
+def _dir_keys_of(paths: Mapping[KeyLike, Path]) -> frozenset[DirKey]:
+    return frozenset(k for k in paths if isinstance(k, DirKey))
+
+
 @dataclass(frozen=True, slots=True)
 class AppConfig:
     """Per-app overrides."""
@@ -88,23 +132,59 @@ class AppConfig:
     base: Path | None = None
     install: InstallOverride = field(default_factory=InstallOverride)
     paths: Mapping[KeyLike, Path] = field(default_factory=dict)
+    # derived from `paths`; a field only because the class uses slots, so it
+    # also shows up in `fields()`/`asdict()`, but never in init/repr/eq
+    _dir_keys: frozenset[DirKey] = field(
+        init=False, repr=False, compare=False, default=frozenset()
+    )
 
     def __post_init__(self) -> None:
-        normalized: dict[KeyLike, Path] = {}
-        for k, v in dict(self.paths).items():
-            normalized[normalize_key(k)] = v
-        object.__setattr__(self, "paths", MappingProxyType(normalized))
+        paths = {normalize_key(k): v for k, v in self.paths.items()}
+        # read-only so `_dir_keys` cannot drift from `paths`
+        object.__setattr__(self, "paths", MappingProxyType(paths))
+        object.__setattr__(self, "_dir_keys", _dir_keys_of(paths))
+
+    @classmethod
+    def _from_normalized(
+        cls,
+        *,
+        base: Path | None,
+        install: InstallOverride,
+        paths: dict[KeyLike, Path],
+    ) -> "AppConfig":
+        """Build from already-normalized `paths`, skipping `__post_init__`."""
+
+        obj = object.__new__(cls)
+        object.__setattr__(obj, "base", base)
+        object.__setattr__(obj, "install", install)
+        object.__setattr__(obj, "paths", MappingProxyType(paths))
+        object.__setattr__(obj, "_dir_keys", _dir_keys_of(paths))
+        return obj
+
+    @property
+    def dir_keys(self) -> frozenset[DirKey]:
+        """The `DirKey` members among `paths`, computed once at construction."""
+
+        return self._dir_keys
 
     def path_override(self, key: KeyLike) -> Path | None:
+        if isinstance(key, DirKey):
+            return self.paths.get(key)
         return self.paths.get(normalize_key(key))
 
     def merged(self, higher: "AppConfig") -> "AppConfig":
-        merged_paths = dict(self.paths)
-        merged_paths.update(higher.paths)
-        return AppConfig(
+        # configs are frozen, so an empty higher layer can share `self`
+        if (
+            not higher.paths
+            and higher.base is None
+            and higher.install.root is None
+            and higher.install.executable is None
+        ):
+            return self
+        return AppConfig._from_normalized(
             base=higher.base if higher.base is not None else self.base,
             install=self.install.merged(higher.install),
-            paths=merged_paths,
+            paths={**self.paths, **higher.paths},
         )
 
 
@@ -112,35 +192,23 @@ def _parse_install_table(
     app_id: str,
     table: Any,
     *,
-    env: Mapping[str, str],
-    home: Path,
-    base_dir: Path,
+    parse: _PathParser,
 ) -> InstallOverride:
     if table is None:
         return InstallOverride()
-    if not isinstance(table, Mapping):
+    if not isinstance(table, (dict, Mapping)):
         raise VFXDirsConfigError(
             f"`apps.{app_id}.install` must be a TOML table or object"
         )
 
     install_root = None
     if "root" in table and table["root"] is not None:
-        install_root = _parse_path(
-            table["root"],
-            env=env,
-            home=home,
-            base_dir=base_dir,
-            where=f"apps.{app_id}.install.root",
-        )
+        install_root = parse(table["root"], f"apps.{app_id}.install.root")
 
     install_exe = None
     if "executable" in table and table["executable"] is not None:
-        install_exe = _parse_path(
-            table["executable"],
-            env=env,
-            home=home,
-            base_dir=base_dir,
-            where=f"apps.{app_id}.install.executable",
+        install_exe = parse(
+            table["executable"], f"apps.{app_id}.install.executable"
         )
 
     return InstallOverride(root=install_root, executable=install_exe)
@@ -150,69 +218,50 @@ def _parse_paths_table(
     app_id: str,
     table: Any,
     *,
-    env: Mapping[str, str],
-    home: Path,
-    base_dir: Path,
+    parse: _PathParser,
 ) -> dict[KeyLike, Path]:
     if table is None:
         return {}
-    if not isinstance(table, Mapping):
+    if not isinstance(table, (dict, Mapping)):
         raise VFXDirsConfigError(
             f"`apps.{app_id}.paths` must be a TOML table or object"
         )
 
-    paths: dict[KeyLike, Path] = {}
-    for raw_key, raw_value in table.items():
-        key: KeyLike = normalize_key(str(raw_key))
-        paths[key] = _parse_path(
-            raw_value,
-            env=env,
-            home=home,
-            base_dir=base_dir,
-            where=f"apps.{app_id}.paths.{raw_key}",
+    return {
+        normalize_key(str(raw_key)): parse(
+            raw_value, f"apps.{app_id}.paths.{raw_key}"
         )
-    return paths
+        for raw_key, raw_value in table.items()
+    }
 
 
 def _parse_app_config(
     app_id: str,
     table: Any,
     *,
-    env: Mapping[str, str],
-    ctx: Context,
-    base_dir: Path,
+    parse: _PathParser,
 ) -> AppConfig:
-    if not isinstance(table, Mapping):
+    if not isinstance(table, (dict, Mapping)):
         raise VFXDirsConfigError(
             f"`apps.{app_id}` must be a TOML table or object")
 
     base: Path | None = None
     if "base" in table and table["base"] is not None:
-        base = _parse_path(
-            table["base"],
-            env=env,
-            home=ctx.home,
-            base_dir=base_dir,
-            where=f"apps.{app_id}.base",
-        )
+        base = parse(table["base"], f"apps.{app_id}.base")
 
     install = _parse_install_table(
         app_id,
         table.get("install"),
-        env=env,
-        home=ctx.home,
-        base_dir=base_dir,
+        parse=parse,
     )
 
     paths = _parse_paths_table(
         app_id,
         table.get("paths"),
-        env=env,
-        home=ctx.home,
-        base_dir=base_dir,
+        parse=parse,
     )
 
-    return AppConfig(base=base, install=install, paths=paths)
+    return AppConfig._from_normalized(base=base, install=install, paths=paths)
 
 
 @dataclass(frozen=True, slots=True)
@@ -222,35 +271,47 @@ class VFXDirsConfig:
     apps: Mapping[str, AppConfig] = field(default_factory=dict)
 
     def __post_init__(self) -> None:
-        normalized: dict[str, AppConfig] = {}
-        for app_id, cfg in dict(self.apps).items():
-            norm_id = _normalize_app_id(app_id)
-            normalized[norm_id] = cfg
-        object.__setattr__(self, "apps", MappingProxyType(normalized))
+        apps = {_normalize_app_id(app_id): cfg for app_id, cfg in self.apps.items()}
+        # read-only so stored app ids stay normalized and merged configs
+        # can safely share `self`
+        object.__setattr__(self, "apps", MappingProxyType(apps))
+
+    @classmethod
+    def _from_normalized(cls, *, apps: dict[str, AppConfig]) -> "VFXDirsConfig":
+        """Build from already-normalized app ids, skipping `__post_init__`."""
+
+        obj = object.__new__(cls)
+        object.__setattr__(obj, "apps", MappingProxyType(apps))
+        return obj
 
     def app(self, app_id: str) -> AppConfig | None:
         return self.apps.get(_normalize_app_id(app_id))
 
     def path_override(self, app_id: str, key: KeyLike) -> Path | None:
-        app_cfg = self.app(app_id)
+        # `apps` is read-only with normalized ids, so an exact hit is safe
+        app_cfg = self.apps.get(app_id)
         if app_cfg is None:
-            return None
+            app_cfg = self.app(app_id)
+            if app_cfg is None:
+                return None
         return app_cfg.path_override(key)
 
     def merged(self, higher: "VFXDirsConfig | None") -> "VFXDirsConfig":
         """Return a new config where `higher` takes precedence over `self`."""
 
-        if higher is None:
+        if higher is None or not higher.apps:
             return self
 
-        merged_apps: dict[str, AppConfig] = dict(self.apps)
-        for app_id, higher_app in higher.apps.items():
-            lower_app = merged_apps.get(app_id)
-            merged_apps[app_id] = (
-                higher_app if lower_app is None else lower_app.merged(
-                    higher_app)
+        lower_apps = self.apps
+        overrides = {
+            app_id: (
+                lower_apps[app_id].merged(higher_app)
+                if app_id in lower_apps
+                else higher_app
             )
-        return VFXDirsConfig(apps=merged_apps)
+            for app_id, higher_app in higher.apps.items()
+        }
+        return VFXDirsConfig._from_normalized(apps={**lower_apps, **overrides})
 
     @classmethod
     def from_file(
@@ -260,8 +321,11 @@ class VFXDirsConfig:
         env: Mapping[str, str] | None = None,
         context: Context | None = None,
     ) -> "VFXDirsConfig":
+        import tomllib  # deferred, only file loading needs the parser
+
         config_path = Path(path)
-        data = tomllib.loads(config_path.read_text(encoding="utf-8"))
+        with config_path.open("rb") as fp:
+            data = tomllib.load(fp)
         return cls.from_mapping(
             data,
             base_dir=config_path.parent,
@@ -300,39 +364,45 @@ class VFXDirsConfig:
         env: Mapping[str, str] | None = None,
         context: Context | None = None,
     ) -> "VFXDirsConfig":
-        if not isinstance(data, Mapping):
+        # tomllib always yields dicts, so test the concrete type before the ABC
+        if not isinstance(data, (dict, Mapping)):
             raise VFXDirsConfigError(
                 "Config root must be a TOML table or object")
 
-        ctx = context or Context.from_env(env)
-        env_map = ctx.env if env is None else env
+        # only env and home are needed here, so avoid building a full Context
+        if context is None:
+            _, env_map, home = resolve_env_and_home(env)
+        else:
+            env_map = context.env if env is None else env
+            home = context.home
 
         raw_apps = data.get("apps", {})
         if raw_apps is None:
             raw_apps = {}
-        if not isinstance(raw_apps, Mapping):
+        if not isinstance(raw_apps, (dict, Mapping)):
             raise VFXDirsConfigError(
                 "`apps` must be a TOML table or object")
 
+        parse = _make_path_parser(env_map, home, base_dir)
         apps: dict[str, AppConfig] = {}
         for raw_id, raw_tbl in raw_apps.items():
             app_id = _normalize_app_id(str(raw_id))
             apps[app_id] = _parse_app_config(
                 app_id,
                 raw_tbl,
-                env=env_map,
-                ctx=ctx,
-                base_dir=base_dir,
+                parse=parse,
             )
 
-        return cls(apps=apps)
+        return cls._from_normalized(apps=apps)
 
 
+@lru_cache(maxsize=256)
 def _normalize_app_id(app_id: str) -> str:
     raw = app_id.strip().lower()
     if not raw:
         raise VFXDirsConfigError("app_id cannot be empty")
-    return raw
+    # interned so dict lookups on app ids can match by identity
+    return sys.intern(raw)
 
 
 def supported_app_keys(config: VFXDirsConfig, app_id: str) -> set[DirKey]:
@@ -341,4 +411,6 @@ def supported_app_keys(config: VFXDirsConfig, app_id: str) -> set[DirKey]:
     app_cfg = config.app(app_id)
     if app_cfg is None:
         return set()
-    return {k for k in app_cfg.paths.keys() if isinstance(k, DirKey)}
+    # copy to keep returning a caller-owned `set`; use `AppConfig.dir_keys`
+    # directly to avoid it
+    return set(app_cfg.dir_keys)
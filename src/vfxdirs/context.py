@@ -5,7 +5,7 @@ import sys
 import tempfile
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, Mapping, TypeAlias
+from typing import Callable, Literal, Mapping, TypeAlias
 
 OSName: TypeAlias = Literal["windows", "macos", "linux"]
 
@@ -29,9 +29,86 @@ def _home_from_env(os_name: OSName, env: Mapping[str, str]) -> Path:
     return Path(value) if value else Path.home()
 
 
+def resolve_env_and_home(
+    env: Mapping[str, str] | None = None,
+    *,
+    os_name: OSName | None = None,
+    home: Path | None = None,
+) -> tuple[OSName, Mapping[str, str], Path]:
+    """Resolve the OS name, env mapping and home dir the way `Context` does.
+
+    For callers that only need these and not a full `Context`.
+    """
+
+    env_map: Mapping[str, str]
+    if env is None:
+        # snapshot so lookups are plain dict gets, later changes to
+        # os.environ are not seen by the caller
+        env_map = dict(os.environ)
+    else:
+        env_map = env
+
+    detected_os = os_name or _detect_os_name()
+    resolved_home = home or _home_from_env(detected_os, env_map)
+    return detected_os, env_map, resolved_home
+
+
+_OSDirs: TypeAlias = tuple[Path, Path, Path, tuple[Path, ...]]
+
+_LINUX_INSTALL_ROOTS = (Path("/opt"), Path("/usr/local"), Path("/usr"))
+_MACOS_INSTALL_ROOTS = (Path("/Applications"), Path("/Applications/Utilities"))
+_WINDOWS_PROGRAM_FILES_VARS = ("ProgramFiles", "ProgramW6432", "ProgramFiles(x86)")
+_WINDOWS_DEFAULT_INSTALL_ROOTS = (Path("C:/Program Files"),)
+
+
+# TODO: worth using platformdirs? Would like to avoid external deps
+def _linux_dirs(env: Mapping[str, str], home: Path) -> _OSDirs:
+    config_home = Path(env.get("XDG_CONFIG_HOME", home / ".config"))
+    data_home = Path(env.get("XDG_DATA_HOME", home / ".local" / "share"))
+    cache_home = Path(env.get("XDG_CACHE_HOME", home / ".cache"))
+    return config_home, data_home, cache_home, _LINUX_INSTALL_ROOTS
+
+
+def _macos_dirs(env: Mapping[str, str], home: Path) -> _OSDirs:
+    library = home / "Library"
+    config_home = library / "Application Support"
+    cache_home = library / "Caches"
+    return config_home, config_home, cache_home, _MACOS_INSTALL_ROOTS
+
+
+def _windows_dirs(env: Mapping[str, str], home: Path) -> _OSDirs:
+    appdata = env.get("APPDATA")
+    localappdata = env.get("LOCALAPPDATA")
+
+    config_home = Path(appdata) if appdata else home / "AppData" / "Roaming"
+    cache_home = (
+        Path(localappdata) if localappdata else home / "AppData" / "Local"
+    )
+
+    install_roots = tuple(
+        Path(value)
+        for key in _WINDOWS_PROGRAM_FILES_VARS
+        if (value := env.get(key))
+    ) or _WINDOWS_DEFAULT_INSTALL_ROOTS
+    return config_home, config_home, cache_home, install_roots
+
+
+# os_name can be overridden per call, so dispatch on it rather than binding
+# a single builder at import time
+_OS_DIR_BUILDERS: dict[OSName, Callable[[Mapping[str, str], Path], _OSDirs]] = {
+    "linux": _linux_dirs,
+    "macos": _macos_dirs,
+    "windows": _windows_dirs,
+}
+
+
 @dataclass(frozen=True, slots=True)
 class Context:
-    """OS/environment facts used during path resolution."""
+    """OS/environment facts used during path resolution.
+
+    When built from the process environment, `env` is a snapshot taken at
+    construction time.
+    """
 
     os: OSName
     env: Mapping[str, str]
@@ -52,53 +129,17 @@ class Context:
         home: Path | None = None,
         cwd: Path | None = None,
     ) -> "Context":
-        env_map: Mapping[str, str]
-        if env is None:
-            # TODO: is this stable enough for all callers?
-            env_map = os.environ
-        else:
-            env_map = env
-
-        detected_os = os_name or _detect_os_name()
-        resolved_home = home or _home_from_env(detected_os, env_map)
+        detected_os, env_map, resolved_home = resolve_env_and_home(
+            env, os_name=os_name, home=home
+        )
         resolved_cwd = cwd or Path.cwd()
         temp_dir = Path(tempfile.gettempdir())
 
-        # TODO: worth using platformdirs? Would like to avoid external deps
-        if detected_os == "linux":
-            config_home = Path(env_map.get(
-                "XDG_CONFIG_HOME", resolved_home / ".config"))
-            data_home = Path(env_map.get(
-                "XDG_DATA_HOME", resolved_home / ".local" / "share"))
-            cache_home = Path(env_map.get(
-                "XDG_CACHE_HOME", resolved_home / ".cache"))
-            install_roots = (Path("/opt"), Path("/usr/local"), Path("/usr"))
-        elif detected_os == "macos":
-            library = resolved_home / "Library"
-            config_home = library / "Application Support"
-            data_home = library / "Application Support"
-            cache_home = library / "Caches"
-            install_roots = (Path("/Applications"),
-                             Path("/Applications/Utilities"))
-        else:  # windows
-            appdata = env_map.get("APPDATA")
-            localappdata = env_map.get("LOCALAPPDATA")
-
-            config_home = Path(
-                appdata) if appdata else resolved_home / "AppData" / "Roaming"
-            data_home = config_home
-            cache_home = (
-                Path(localappdata) if localappdata else resolved_home /
-                "AppData" / "Local"
-            )
-
-            roots: list[Path] = []
-            for key in ("ProgramFiles", "ProgramW6432", "ProgramFiles(x86)"):
-                value = env_map.get(key)
-                if value:
-                    roots.append(Path(value))
-            install_roots = tuple(roots) if roots else (
-                Path("C:/Program Files"),)
+        # anything unrecognized falls through to windows, as it always has
+        build_dirs = _OS_DIR_BUILDERS.get(detected_os, _windows_dirs)
+        config_home, data_home, cache_home, install_roots = build_dirs(
+            env_map, resolved_home
+        )
 
         return cls(
             os=detected_os,
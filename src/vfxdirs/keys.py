@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import sys
 from enum import StrEnum
+from functools import lru_cache
 from typing import TypeAlias
 
 
@@ -24,6 +26,9 @@ class DirKey(StrEnum):
 
 KeyLike: TypeAlias = DirKey | str
 
+# value lookup without going through `DirKey(...)` and its ValueError on misses
+_STR_TO_DIRKEY: dict[str, DirKey] = {k.value: k for k in DirKey}
+
 
 def normalize_key(key: KeyLike) -> KeyLike:
     """Normalize a key to a `DirKey` when possible.
@@ -39,13 +44,14 @@ def normalize_key(key: KeyLike) -> KeyLike:
     if not isinstance(key, str):
         raise TypeError(
             f"key must be a DirKey or str, got {type(key).__name__}")
+    return _normalize_str_key(key)
+
 
+@lru_cache(maxsize=1024)
+def _normalize_str_key(key: str) -> KeyLike:
     raw = key.strip()
     if not raw:
         raise ValueError("key cannot be empty")
 
-    raw_lower = raw.lower()
-    try:
-        return DirKey(raw_lower)
-    except ValueError:
-        return raw_lower
+    raw_lower = sys.intern(raw.lower())
+    return _STR_TO_DIRKEY.get(raw_lower, raw_lower)